@@ -1,21 +1,98 @@
-import random
-from scipy.spatial.distance import cityblock
-from itertools import combinations
+import numpy as np
+from numba import njit
+from scipy.spatial.distance import cdist, pdist, squareform
 import networkx as nx
 import matplotlib.pyplot as plt
-from typing import Dict, List, Tuple
+from matplotlib.collections import LineCollection
+from typing import Dict, List
+
+
+@njit(cache=True)
+def _allocate(D: np.ndarray, depots: np.ndarray) -> np.ndarray:
+    """Return, for each node, the depot with minimum distance in D."""
+    n = D.shape[0]
+    out = np.empty(n, dtype=np.int64)
+
+    for i in range(n):
+        best = depots[0]
+        best_dist = D[i, best]
+        for j in depots[1:]:
+            if D[i, j] < best_dist:
+                best_dist = D[i, j]
+                best = j
+        out[i] = best
+
+    return out
+
+
+class PMedianInstance:
+    """
+    Dense-array representation of a p-median instance.
+
+    Stores node coordinates and the full pairwise Manhattan distance matrix
+    as NumPy arrays, so that hot solver operations (sorted distances per
+    node, distance lookups, allocation argmins) are array indexing instead
+    of NetworkX adjacency-dict lookups. The NetworkX graph is kept only for
+    plotting.
+
+    Attributes:
+        coords (np.ndarray): An (n, 2) array of node coordinates.
+        D (np.ndarray): An (n, n) symmetric matrix of pairwise Manhattan
+                        distances, with a zero diagonal.
+    """
+
+    # Tile size for the blocked distance-matrix build; one block pair of
+    # float32 coords and the output tile fit comfortably in L2 cache
+    _BLOCK_SIZE = 1024
+
+    def __init__(self, coords) -> None:
+        self.coords = np.asarray(coords, dtype=np.int32)
+        self.D = self._distance_matrix(self.coords)
+
+    @classmethod
+    def _distance_matrix(cls, coords: np.ndarray) -> np.ndarray:
+        n = coords.shape[0]
+
+        if n <= cls._BLOCK_SIZE:
+            return squareform(pdist(coords, metric="cityblock")).astype(np.int32)
+
+        # For large n, compute the matrix tile by tile with cdist on float32
+        # coordinates so each tile stays cache-resident and SIMD-friendly.
+        # The matrix is symmetric, so only tiles on or above the diagonal
+        # are computed; the rest are mirrored
+        coords32 = coords.astype(np.float32)
+        D = np.empty((n, n), dtype=np.int32)
+        bs = cls._BLOCK_SIZE
+        for i0 in range(0, n, bs):
+            for j0 in range(i0, n, bs):
+                block = cdist(
+                    coords32[i0 : i0 + bs], coords32[j0 : j0 + bs], metric="cityblock"
+                ).astype(np.int32)
+                D[i0 : i0 + bs, j0 : j0 + bs] = block
+                if j0 > i0:
+                    D[j0 : j0 + bs, i0 : i0 + bs] = block.T
+
+        return D
+
+    @classmethod
+    def from_graph(cls, G: nx.Graph) -> "PMedianInstance":
+        """Build an instance from a NetworkX graph with 'pos' node attributes."""
+        return cls([G.nodes[i]["pos"] for i in range(len(G.nodes))])
 
 
 def generate_all_edges(G: nx.Graph) -> None:
-    # Calculate Manhattan distances between node pairs
-    distances = {
-        (i, j): int(cityblock(G.nodes[i]["pos"], G.nodes[j]["pos"]))
-        for i, j in combinations(G.nodes, 2)
-    }
+    # Calculate Manhattan distances between all node pairs in one
+    # vectorized pdist call instead of a Python loop over pairs
+    n = len(G.nodes)
+    coords = np.asarray([G.nodes[i]["pos"] for i in range(n)], dtype=np.int32)
+    distances = pdist(coords, metric="cityblock").astype(np.int64)
 
-    # Add edges with distances
-    for (i, j), dist in distances.items():
-        G.add_edge(i, j, d=dist)
+    # Add all edges with distances in one bulk call
+    iu, ju = np.triu_indices(n, k=1)
+    G.add_edges_from(
+        (i, j, {"d": dist})
+        for i, j, dist in zip(iu.tolist(), ju.tolist(), distances.tolist())
+    )
 
 
 def create_graph(nnodes: int, mapsize: int, seed: int = 42) -> nx.Graph:
@@ -40,17 +117,14 @@ def create_graph(nnodes: int, mapsize: int, seed: int = 42) -> nx.Graph:
     if seed < 10:
         raise ValueError("seed must be greater than or equal to 10")
 
-    random.seed(seed)
-    nodes = list(range(nnodes))
-
-    # Generate random coordinates for each node
-    coords = [(random.randint(0, mapsize), random.randint(0, mapsize)) for _ in nodes]
+    # Generate random coordinates for all nodes in one batched call
+    rng = np.random.default_rng(seed)
+    coords = rng.integers(0, mapsize + 1, size=(nnodes, 2), dtype=np.int32)
 
     G: nx.Graph = nx.Graph()
 
-    # Add nodes with attributes
-    for i in nodes:
-        G.add_node(i, pos=coords[i])
+    # Add all nodes with attributes in one bulk call
+    G.add_nodes_from((i, {"pos": (int(x), int(y))}) for i, (x, y) in enumerate(coords))
 
     generate_all_edges(G)
 
@@ -70,10 +144,15 @@ def get_allocation_dict(depots: List[int], G: nx.Graph) -> Dict[int, int]:
                       If a node is a depot, it maps to itself.
     """
 
-    def closest_depot(G: nx.Graph, depots: List[int], i: int) -> int:
-        return min(depots, key=lambda j: G.get_edge_data(i, j)["d"])
+    D = PMedianInstance.from_graph(G).D
+
+    depots_arr = np.asarray(depots, dtype=np.int64)
+    closest = _allocate(D, depots_arr)
 
-    return {i: i if i in depots else closest_depot(G, depots, i) for i in G.nodes}
+    # Depots are always allocated to themselves
+    closest[depots_arr] = depots_arr
+
+    return {i: int(j) for i, j in enumerate(closest)}
 
 
 def plot_solution(G: nx.Graph, allocation: Dict[int, int]) -> None:
@@ -93,24 +172,15 @@ def plot_solution(G: nx.Graph, allocation: Dict[int, int]) -> None:
     # Draw all nodes
     nx.draw_networkx_nodes(G, pos, node_size=10)
 
-    # Group edges by depot
-    edges_by_depot: Dict[int, List[Tuple[int, int]]] = {}
-    for node, depot in allocation.items():
-        if node == depot:
-            continue  # skip self-edges
-        edges_by_depot.setdefault(depot, []).append((node, depot))
-
-    # Assign a random color to each depot
-    colors = {
-        depot: (random.random(), random.random(), random.random())
-        for depot in edges_by_depot
-    }
-
-    # Draw edges connecting each node to its depot
-    for depot, edges in edges_by_depot.items():
-        nx.draw_networkx_edges(
-            G, pos, edgelist=edges, edge_color=[colors[depot]], width=2
-        )
+    # Assign a deterministic color to each depot from a categorical colormap
+    depots = sorted(set(allocation.values()))
+    cmap = plt.get_cmap("tab20")
+    depot_color = {depot: cmap(idx % 20) for idx, depot in enumerate(depots)}
+
+    # Draw all node-depot edges as a single line collection
+    segments = [(pos[i], pos[d]) for i, d in allocation.items() if i != d]
+    colors = [depot_color[d] for i, d in allocation.items() if i != d]
+    plt.gca().add_collection(LineCollection(segments, colors=colors, linewidths=2))
 
     plt.title("Allocation")
     plt.axis("off")
@@ -118,16 +188,14 @@ def plot_solution(G: nx.Graph, allocation: Dict[int, int]) -> None:
 
 
 def compute_total_distance(depots: List[int], G: nx.Graph) -> int:
-    # Get assignment of nodes to depots
-    allocation = get_allocation_dict(depots, G)
-
-    total_distance = 0
-    for i in allocation:
-        if i in depots:
-            continue
+    # Build the distance matrix once and assign nodes to depots directly,
+    # rather than going through get_allocation_dict and building it twice
+    D = PMedianInstance.from_graph(G).D
 
-        total_distance += G.get_edge_data(i, allocation[i])["d"]
+    depots_arr = np.asarray(depots, dtype=np.int64)
+    closest = _allocate(D, depots_arr)
+    closest[depots_arr] = depots_arr
 
-    return total_distance
+    return int(D[np.arange(D.shape[0]), closest].sum())
 
 
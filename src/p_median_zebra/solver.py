@@ -1,38 +1,55 @@
+import math
 import time
+from itertools import combinations
 from typing import Dict, List, Any, Tuple
-from collections import defaultdict
 
 import numpy as np
 import networkx as nx
 import highspy
+from numba import njit, prange
 
 from p_median_zebra import graph
 from p_median_zebra import config
 
 
-def compute_sorted_dist(G: nx.Graph) -> Dict[int, np.ndarray]:
+def _check_status(status: highspy.HighsStatus, call: str) -> None:
+    """Raise if a HiGHS model-building call reported an error."""
+    if status == highspy.HighsStatus.kError:
+        raise RuntimeError(f"{call} failed with status {status}")
+
+
+def compute_sorted_dist(D: np.ndarray) -> Dict[int, np.ndarray]:
     """
-    Compute the sorted unique distances from each node to all other nodes in the graph.
+    Compute the sorted unique distances from each node to all other nodes.
 
     Parameters:
-        G (nx.Graph): The input graph with edge attribute 'd' for distance.
+        D (np.ndarray): The (n, n) pairwise distance matrix.
 
     Returns:
         dict: A dictionary mapping each node to a sorted array of unique distances.
     """
-    n = len(G.nodes)
+    n = D.shape[0]
 
-    dists = np.zeros((n, n))
-    for i, j, d in G.edges(data="d"):
-        dists[i, j] = d
-        dists[j, i] = d
+    # Manhattan distances on an integer grid are bounded integers, so the
+    # unique values per row can be collected with one boolean scatter into
+    # buckets instead of a comparison sort per row
+    nbuckets = int(D.max()) + 1
+    present = np.zeros((n, nbuckets), dtype=bool)
+    present[np.arange(n)[:, None], D] = True
 
-    return {i: np.unique(dists[i, :]) for i in G.nodes}
+    # Read all rows back with a single nonzero pass; np.nonzero walks the
+    # table row-major, so splitting by per-row counts yields each node's
+    # sorted unique distances without a Python-level call per row
+    _, values = np.nonzero(present)
+    counts = np.count_nonzero(present, axis=1)
+    per_node = np.split(values, np.cumsum(counts)[:-1])
+
+    return dict(enumerate(per_node))
 
 
 def add_z_variables(
-    h: highspy.Highs, G: nx.Graph, dsorted: Dict[int, np.ndarray], maxk: int
-) -> Dict[int, Dict[int, Any]]:
+    h: highspy.Highs, n: int, dsorted: Dict[int, np.ndarray], maxk: int
+) -> np.ndarray:
     """
     Add continuous z variables to the HiGHS model.
 
@@ -40,74 +57,204 @@ def add_z_variables(
 
     Parameters:
         h (highspy.Highs): HiGHS optimization model.
-        G (nx.Graph): The graph.
+        n (int): Number of nodes.
         dsorted (dict): Sorted distance thresholds per node.
 
     Returns:
-        dict: A nested dictionary of z variables for each node and distance index.
+        np.ndarray: An (n, n) int32 array of HiGHS column indices, where
+                    `z_idx[i, k]` is the column of z variable (i, k) and -1
+                    marks variables that have not been created.
     """
-    # Generate variable names like "z0.0", "x0.1", ..., "zn.k"
-    n = len(G.nodes)
-
-    if maxk >= len(G.nodes) or maxk < 0:
-        raise ValueError("maxk must be in [0, G.nodes)")
-
-    # Create z variables
-    z: Dict[int, Dict[int, Any]] = defaultdict(lambda: defaultdict(object))
+    if maxk >= n or maxk < 0:
+        raise ValueError("maxk must be in [0, n)")
+
+    # Accumulate objective coefficients for all (i, k) and record the column
+    # index each variable will get, then push everything in one addCols call
+    z_idx = np.full((n, n), -1, dtype=np.int32)
+    base = h.getNumCol()
+    costs: List[float] = []
     for i, ds in dsorted.items():
         numz = min(maxk + 1, len(ds))
-        deltas = np.diff(np.insert(ds, 0, 0))[:numz].tolist()
-
-        for k in range(1, numz):
-            z[i][k] = h.addVariable(
-                lb=0,
-                ub=1,
-                obj=deltas[k],
-                name=f"z{i}.{k}",
-            )
+        if numz < 2:
+            continue
+
+        # Consecutive threshold gaps, with a single allocation and no copies
+        deltas = ds[1:numz] - ds[: numz - 1]
+
+        z_idx[i, 1:numz] = base + len(costs) + np.arange(numz - 1)
+        costs.extend(deltas.tolist())
+
+    num_cols = len(costs)
+    if num_cols > 0:
+        _check_status(
+            h.addCols(
+                num_cols,
+                np.asarray(costs, dtype=np.float64),
+                np.zeros(num_cols),
+                np.ones(num_cols),
+                0,
+                np.empty(0, dtype=np.int32),
+                np.empty(0, dtype=np.int32),
+                np.empty(0, dtype=np.float64),
+            ),
+            "addCols",
+        )
 
-    return z
+    return z_idx
 
 
-def add_y_variables(h: highspy.Highs, G: nx.Graph) -> List[int]:
+def add_y_variables(h: highspy.Highs, n: int) -> List[int]:
     """
     Add binary y variables to the HiGHS model to indicate whether a node is chosen as a depot.
 
     Parameters:
         h (highspy.Highs): HiGHS optimization model.
-        G (nx.Graph): The graph.
+        n (int): Number of nodes.
 
     Returns:
         list: A list of binary variables y[i] for each node i.
     """
-    return h.addBinaries(len(G.nodes), name=[f"y{i}" for i in G.nodes])
+    return h.addBinaries(n, name=[f"y{i}" for i in range(n)])
 
 
-def add_p_median_constraint(h: highspy.Highs, G: nx.Graph, p: int, y: Any) -> None:
+def add_p_median_constraint(h: highspy.Highs, n: int, p: int, y: Any) -> None:
     """
     Add a constraint ensuring exactly p depots are selected.
 
     Parameters:
         h (highspy.Highs): HiGHS optimization model.
-        G (nx.Graph): The graph.
+        n (int): Number of nodes.
         p (int): Number of depots to select.
         y (list): Binary depot indicator variables.
     """
-    h.addConstrs(h.qsum(y[i] for i in G.nodes) == p)
+    # One direct row push, instead of building an n-term linear expression
+    y_idx = np.asarray([var.index for var in y], dtype=np.int32)
+    _check_status(h.addRow(p, p, n, y_idx, np.ones(n)), "addRow")
 
 
-def get_dist(G: nx.Graph, i: int, j: int) -> int:
-    if i == j:
-        return 0
-    return G.get_edge_data(i, j)["d"]
+def compute_neighbor_order(D: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sort each row of the distance matrix once, for prefix-based neighborhood lookups.
+
+    Parameters:
+        D (np.ndarray): The (n, n) pairwise distance matrix.
+
+    Returns:
+        tuple: `(order, sdist)` where `order[i]` holds the node indices sorted by
+               distance from node i and `sdist[i]` the corresponding distances, so
+               the set {j : D[i, j] < d} is the prefix `order[i, :cut]` with
+               `cut = np.searchsorted(sdist[i], d)`.
+    """
+    # int32 halves the footprint of the only O(n^2) table kept alongside D
+    order = np.argsort(D, axis=1).astype(np.int32)
+    sdist = np.take_along_axis(D, order, axis=1)
+
+    return order, sdist
+
+
+def compute_threshold_cuts(
+    sdist: np.ndarray, dsorted: Dict[int, np.ndarray]
+) -> Dict[int, np.ndarray]:
+    """
+    Count, per node, the neighbors strictly closer than each distance threshold.
+
+    Parameters:
+        sdist (np.ndarray): Sorted distances per row, from compute_neighbor_order.
+        dsorted (dict): Sorted unique distance thresholds per node.
+
+    Returns:
+        dict: A mapping from each node i to an array aligned with `dsorted[i]`,
+              where entry k is the prefix length of `order[i]` containing the
+              nodes with distance below `dsorted[i][k]`. Shared by the initial
+              model build and every column-generation iteration.
+    """
+    return {i: np.searchsorted(sdist[i], ds, side="left") for i, ds in dsorted.items()}
+
+
+@njit(cache=True, parallel=True)
+def _fill_csr_indices(
+    row_i: np.ndarray,
+    row_k: np.ndarray,
+    row_cut: np.ndarray,
+    starts: np.ndarray,
+    order: np.ndarray,
+    y_idx: np.ndarray,
+    z_idx: np.ndarray,
+    indices: np.ndarray,
+) -> None:
+    """Fill the CSR column indices for a batch of z-y definition rows."""
+    for r in prange(row_i.shape[0]):
+        i = row_i[r]
+        cut = row_cut[r]
+        pos = starts[r]
+
+        indices[pos] = z_idx[i, row_k[r]]
+        for t in range(cut):
+            indices[pos + 1 + t] = y_idx[order[i, t]]
+
+
+def add_z_y_def_rows(
+    h: highspy.Highs,
+    order: np.ndarray,
+    y: Any,
+    z_idx: np.ndarray,
+    row_i: np.ndarray,
+    row_k: np.ndarray,
+    row_cut: np.ndarray,
+) -> None:
+    """
+    Push a batch of z-y definition rows `z[i][k] + sum(y[j] : D[i,j] < dik) >= 1`
+    to the model with a single CSR addRows call.
+
+    Parameters:
+        h (highspy.Highs): The HiGHS model instance.
+        order (np.ndarray): Node indices sorted by distance, per row.
+        y (list): List of binary variables indicating depot selection.
+        z_idx (np.ndarray): Column indices of z variables, indexed by (i, k).
+        row_i (np.ndarray): Node index i of each constraint row to add.
+        row_k (np.ndarray): Threshold index k of each row.
+        row_cut (np.ndarray): Length of the `order[i]` prefix holding the nodes
+                              below each row's distance threshold.
+    """
+    num_rows = len(row_i)
+    if num_rows == 0:
+        return
+
+    y_idx = np.asarray([var.index for var in y], dtype=np.int32)
+
+    # Each row holds one z coefficient plus its y prefix
+    row_i = np.asarray(row_i, dtype=np.int64)
+    row_k = np.asarray(row_k, dtype=np.int64)
+    row_cut = np.asarray(row_cut, dtype=np.int64)
+    nnz = int(num_rows + row_cut.sum())
+
+    starts = np.zeros(num_rows, dtype=np.int32)
+    starts[1:] = np.cumsum(1 + row_cut[:-1])
+
+    indices = np.empty(nnz, dtype=np.int32)
+    _fill_csr_indices(row_i, row_k, row_cut, starts, order, y_idx, z_idx, indices)
+
+    _check_status(
+        h.addRows(
+            num_rows,
+            np.ones(num_rows),
+            np.full(num_rows, highspy.kHighsInf),
+            nnz,
+            starts,
+            indices,
+            np.ones(nnz),
+        ),
+        "addRows",
+    )
 
 
 def add_z_y_def_constraints(
     h: highspy.Highs,
-    G: nx.Graph,
+    order: np.ndarray,
+    cuts: Dict[int, np.ndarray],
     dsorted: Dict[int, np.ndarray],
     y: Any,
-    z: Dict[int, Dict[int, Any]],
+    z_idx: np.ndarray,
     maxk: int,
 ) -> None:
     """
@@ -115,32 +262,27 @@ def add_z_y_def_constraints(
 
     Parameters:
         h (highspy.Highs): The HiGHS model instance.
-        G (nx.Graph): The graph representing the problem.
+        order (np.ndarray): Node indices sorted by distance, per row.
+        cuts (dict): Prefix lengths per threshold, from compute_threshold_cuts.
         dsorted (dict): Sorted distance values for each node.
         y (list): List of binary variables indicating depot selection.
-        z (dict): Dictionary of z variables grouped by node.
+        z_idx (np.ndarray): Column indices of z variables, indexed by (i, k).
     """
-    if maxk >= len(G.nodes) or maxk < 0:
-        raise ValueError("maxk must be in [0, G.nodes)")
-
-    for i in G.nodes:
-        last = min(maxk + 1, len(dsorted[i]))
-        h.addConstrs(
-            create_z_y_def_linexpr(h, G, y, z, i, k, d) >= 1
-            for k, d in enumerate(dsorted[i][1:last], start=1)
-        )
+    n = order.shape[0]
 
+    if maxk >= n or maxk < 0:
+        raise ValueError("maxk must be in [0, n)")
 
-def create_z_y_def_linexpr(
-    h: highspy.Highs,
-    G: nx.Graph,
-    y: Any,
-    z: Dict[int, Dict[int, Any]],
-    i: int,
-    k: int,
-    dik: int,
-) -> Any:
-    return z[i][k] + h.qsum(y[j] for j in G.nodes if get_dist(G, i, j) < dik)
+    # Build the row descriptors as arrays directly: node i contributes rows
+    # for k = 1 .. numz_i - 1, with cuts gathered from the precomputed table
+    numz = np.array([min(maxk + 1, len(dsorted[i])) for i in range(n)], dtype=np.int64)
+    counts = numz - 1
+
+    row_i = np.repeat(np.arange(n), counts)
+    row_k = np.arange(row_i.size) - np.repeat(np.cumsum(counts) - counts, counts) + 1
+    row_cut = np.concatenate([cuts[i][1 : numz[i]] for i in range(n)])
+
+    add_z_y_def_rows(h, order, y, z_idx, row_i, row_k, row_cut)
 
 
 def get_optimal_depots(h: highspy.Highs, y: Any) -> List[int]:
@@ -154,34 +296,68 @@ def get_optimal_depots(h: highspy.Highs, y: Any) -> List[int]:
     Returns:
         list: Indices of nodes that are selected as depots.
     """
-    return [i for i, y in enumerate(h.vals(y)) if y > 1e-2]
+    vals = np.asarray(h.vals(y))
+    return np.flatnonzero(vals > 1e-2).tolist()
 
 
 def create_p_median_model(
     h: highspy.Highs,
-    G: nx.Graph,
+    order: np.ndarray,
+    cuts: Dict[int, np.ndarray],
     dsorted: Dict[int, np.ndarray],
     p: int,
     maxk: int = -1,
 ):
-    if maxk >= len(G.nodes) or maxk < 0:
-        raise ValueError("maxk must be in [0, G.nodes)")
+    n = order.shape[0]
+
+    if maxk >= n or maxk < 0:
+        raise ValueError("maxk must be in [0, n)")
 
     # Create model variables
-    z = add_z_variables(h, G, dsorted, maxk)
-    y = add_y_variables(h, G)
+    z_idx = add_z_variables(h, n, dsorted, maxk)
+    y = add_y_variables(h, n)
 
     # Create constraints
-    add_p_median_constraint(h, G, p, y)
-    add_z_y_def_constraints(h, G, dsorted, y, z, maxk)
+    add_p_median_constraint(h, n, p, y)
+    add_z_y_def_constraints(h, order, cuts, dsorted, y, z_idx, maxk)
+
+    return y, z_idx
 
-    return y, z
+
+# Largest number of depot subsets worth evaluating exhaustively before
+# building a MIP pays off
+_ENUM_MAX_COMBINATIONS = 20_000
+
+
+def solve_p_median_enumeration(D: np.ndarray, p: int) -> List[int]:
+    """
+    Solves the p-median problem by evaluating every depot subset explicitly.
+
+    Parameters:
+        D (np.ndarray): The (n, n) pairwise distance matrix.
+        p (int): The number of depots to be selected.
+
+    Returns:
+        list: Indices of nodes selected as depots in the optimal solution.
+    """
+    best_cost = None
+    best_combo = None
+    for combo in combinations(range(D.shape[0]), p):
+        cost = D[:, combo].min(axis=1).sum()
+        if best_cost is None or cost < best_cost:
+            best_cost = cost
+            best_combo = combo
+
+    return list(best_combo)
 
 
 def solve_p_median_mip(G: nx.Graph, p: int) -> List[int]:
     """
     Solves the p-median problem on the given graph using the HiGHS solver.
 
+    Small instances are dispatched to explicit enumeration instead, which
+    beats the cost of building and solving a MIP.
+
     Parameters:
         G (nx.Graph): The input graph with edge attribute 'd' for distances.
         p (int): The number of depots to be selected.
@@ -191,14 +367,25 @@ def solve_p_median_mip(G: nx.Graph, p: int) -> List[int]:
     """
     start = time.time()
 
+    # Build the dense distance matrix once
+    D = graph.PMedianInstance.from_graph(G).D
+
+    # For tiny instances, skip the solver entirely
+    if math.comb(D.shape[0], p) <= _ENUM_MAX_COMBINATIONS:
+        depots = solve_p_median_enumeration(D, p)
+        print(f"Problem solved in {time.time() - start:.2f} seconds")
+        return depots
+
     h = highspy.Highs()
     h.silent()
 
-    # Create vector of Dik
-    dsorted = compute_sorted_dist(G)
+    # Create vector of Dik, sorted-neighbor arrays and threshold cuts
+    dsorted = compute_sorted_dist(D)
+    order, sdist = compute_neighbor_order(D)
+    cuts = compute_threshold_cuts(sdist, dsorted)
 
     # Create model in HiGHS
-    y, z = create_p_median_model(h, G, dsorted, p, len(G.nodes) - 1)
+    y, z_idx = create_p_median_model(h, order, cuts, dsorted, p, D.shape[0] - 1)
 
     # Solve MIP
     h.run()
@@ -218,12 +405,16 @@ def solve_p_median_mip(G: nx.Graph, p: int) -> List[int]:
 
 def zebra_column_generation_lp(
     h: highspy.Highs,
-    G: nx.Graph,
+    order: np.ndarray,
+    cuts: Dict[int, np.ndarray],
     dsorted: Dict[int, np.ndarray],
     maxk: int,
     y: Any,
-    z: Dict[int, Dict[int, Any]],
-) -> Tuple[Dict[int, int], List[int]]:
+    z_idx: np.ndarray,
+    time_budget: float = 300.0,
+    stall_tol: float = 1e-9,
+    stall_limit: int = 100,
+) -> Dict[int, int]:
     """
     Performs column generation for the LP relaxation of the p-median problem using the Zebra algorithm.
 
@@ -233,55 +424,150 @@ def zebra_column_generation_lp(
 
     Parameters:
         h (highspy.Highs): The Highs model object used for solving the LP.
-        G (nx.Graph): The input graph with edge attribute 'd' representing distances.
+        order (np.ndarray): Node indices sorted by distance, per row.
+        cuts (Dict[int, np.ndarray]): Prefix lengths per threshold, from
+                                      compute_threshold_cuts.
         dsorted (Dict[int, np.ndarray]): A dictionary mapping each node to a sorted array
                                          of distances to other nodes.
         maxk (int): Initial maximum number of k-level distance thresholds to consider per node.
         y (highspy.HighspyArray): Array of binary depot decision variables (relaxed to continuous).
-        z (Dict[int, Dict[int, highspy.highs_var]]): Nested dictionary of assignment variables
-                                                     z[i][k], where i is the client and k is the
-                                                     index in the sorted distance list.
+        z_idx (np.ndarray): Column indices of assignment variables z[i][k], where i is
+                            the client and k is the index in the sorted distance list;
+                            -1 marks variables not yet created.
+        time_budget (float): Wallclock limit in seconds for the generation loop.
+        stall_tol (float): Relative objective change below which a solved
+                           iteration counts as stalled.
+        stall_limit (int): Consecutive stalled solves after which the loop gives up.
 
     Returns:
         Dict[int, int]: A dictionary mapping each node to the final k-level used after column generation.
     """
-    kdict = {i: maxk for i in G.nodes}
+    n = order.shape[0]
+    nodes = np.arange(n)
+    kvals = np.full(n, maxk, dtype=np.int64)
+    y_col = np.asarray([var.index for var in y], dtype=np.int64)
+
+    need_solve = True
+    num_new = 0
+    col_value = np.empty(0)
+    start = time.time()
+    prev_obj = None
+    stalled = 0
+    iter_ = 0
+    while True:
+        iter_ += 1
+        if need_solve:
+            # Solve LP
+            h.run()
+
+            # Ensure problem was solved successfully
+            status = h.getModelStatus()
+            if status != highspy.HighsModelStatus.kOptimal:
+                raise RuntimeError(f"Solver failed with status {status}")
+
+            # Count consecutive solves without objective progress
+            obj = h.getObjectiveValue()
+            if prev_obj is not None and abs(obj - prev_obj) < stall_tol * max(
+                1.0, abs(obj)
+            ):
+                stalled += 1
+            else:
+                stalled = 0
+            prev_obj = obj
+
+            col_value = np.asarray(h.getSolution().col_value)
+        else:
+            # The previous iteration's additions were already satisfied, so
+            # the solution is unchanged with the new z variables at zero
+            col_value = np.concatenate([col_value, np.zeros(num_new)])
+
+        # Probe every node's kth variable with one bulk solution read; nodes
+        # whose unique distances are already exhausted have no kth variable
+        kcols = z_idx[nodes, kvals]
+        vals = np.where(kcols >= 0, col_value[np.maximum(kcols, 0)], 0.0)
+
+        violators = np.flatnonzero(vals > 1e-6)
+        if violators.size == 0:
+            break
 
-    for iter_ in range(10000):
-        # Solve LP
-        h.run()
+        # Give up rather than keep generating once the LP objective has
+        # stopped moving or the wallclock budget is spent; returning an
+        # unfinished relaxation here would let the caller report its depots
+        # as optimal, so fail loudly like an unsolved LP does
+        if stalled >= stall_limit:
+            raise RuntimeError(
+                f"Column generation stalled for {stall_limit} consecutive solves"
+            )
+        if time.time() - start > time_budget:
+            raise RuntimeError(
+                f"Column generation exceeded its time budget of {time_budget:.0f}s"
+            )
 
-        # Ensure problem was solved successfully
-        status = h.getModelStatus()
-        if status != highspy.HighsModelStatus.kOptimal:
-            raise RuntimeError(f"Solver failed with status {status}")
+        # Advance only the strongest violators (top 10%, at least one), so
+        # each reoptimization stays small and warm-startable
+        top = max(1, violators.size // 10)
+        if violators.size > top:
+            violators = violators[np.argpartition(vals[violators], -top)[-top:]]
+        newk = sorted(violators.tolist())
 
-        # Get indices of nodes using kth assignment
-        newk = [i for i in G.nodes if h.vals(z[i][kdict[i]]) > 1e-6]
-        if len(newk) == 0:
-            break
+        # Save the optimal basis before growing the model
+        basis = h.getBasis()
 
-        # Generate variables for each of those nodes and update kdict
+        # Generate variables for each of those nodes and advance their k,
+        # pushing all new columns for this iteration in one addCols call
+        base = h.getNumCol()
+        costs: List[float] = []
         for i in newk:
-            k = kdict[i] + 1
+            k = int(kvals[i]) + 1
             assert k < len(dsorted[i])
-            z[i][k] = h.addVariable(
-                lb=0,
-                ub=1,
-                obj=dsorted[i][k] - dsorted[i][k - 1],
-                name=f"z{i}.{k}",
-            )
-            kdict[i] += 1
+            z_idx[i, k] = base + len(costs)
+            costs.append(float(dsorted[i][k] - dsorted[i][k - 1]))
+            kvals[i] += 1
+
+        num_new = len(costs)
+        _check_status(
+            h.addCols(
+                num_new,
+                np.asarray(costs, dtype=np.float64),
+                np.zeros(num_new),
+                np.ones(num_new),
+                0,
+                np.empty(0, dtype=np.int32),
+                np.empty(0, dtype=np.int32),
+                np.empty(0, dtype=np.float64),
+            ),
+            "addCols",
+        )
 
-        # Generate one constraint for each node
-        h.addConstrs(
-            create_z_y_def_linexpr(h, G, y, z, i, kdict[i], dsorted[i][kdict[i]]) >= 1
-            for i in newk
+        # Generate one constraint for each node, pushed in a single batch
+        row_i = np.asarray(newk, dtype=np.int64)
+        row_k = kvals[row_i]
+        row_cut = np.array([cuts[i][kvals[i]] for i in newk], dtype=np.int64)
+        add_z_y_def_rows(h, order, y, z_idx, row_i, row_k, row_cut)
+
+        # Re-solve only if some new row is violated with its z at zero;
+        # otherwise the current solution and basis stay optimal for the
+        # augmented LP and the next probe can reuse them as-is
+        y_vals = col_value[y_col]
+        need_solve = any(
+            y_vals[order[i, :cut]].sum() < 1.0 - 1e-9
+            for i, cut in zip(row_i.tolist(), row_cut.tolist())
         )
 
+        # Extend the saved basis to the grown LP (new columns nonbasic at
+        # their lower bound, new row slacks basic) and pass it back, so the
+        # next run resumes dual simplex from the previous optimum
+        basis.col_status = basis.col_status + [
+            highspy.HighsBasisStatus.kLower
+        ] * num_new
+        basis.row_status = basis.row_status + [
+            highspy.HighsBasisStatus.kBasic
+        ] * len(newk)
+        h.setBasis(basis)
+
     print(f"{iter_} iterations required to solve the LP")
 
-    return kdict, newk
+    return {i: int(kvals[i]) for i in range(n)}
 
 
 def solve_p_median_zebra(G: nx.Graph, p: int, maxk: int = -1) -> List[int]:
@@ -297,50 +583,148 @@ def solve_p_median_zebra(G: nx.Graph, p: int, maxk: int = -1) -> List[int]:
     """
     start = time.time()
 
+    # Build the dense distance matrix once
+    D = graph.PMedianInstance.from_graph(G).D
+    n = D.shape[0]
+
     if maxk == -1:
-        maxk = len(G.nodes) - 1
+        # Start from a small k budget and let column generation grow it only
+        # where the LP needs to; defaulting to n - 1 created the full
+        # z-variable matrix up front and defeated lazy generation
+        maxk = min(n - 1, max(1, int(np.ceil(np.log2(n)))))
 
-    if maxk >= len(G.nodes):
-        raise ValueError("maxk must be <= G.nodes")
+    if maxk >= n:
+        raise ValueError("maxk must be < n")
 
     # Initialise highs model
     h = highspy.Highs()
     h.silent()
 
-    # Create vector of Dik
-    dsorted = compute_sorted_dist(G)
+    # Warm-start each LP re-solve from the previous optimal basis: force
+    # serial dual simplex (the parallel variants ignore a passed basis) and
+    # disable presolve, which would discard the basis between runs
+    h.setOptionValue("solver", "simplex")
+    h.setOptionValue("simplex_strategy", 1)
+    h.setOptionValue("presolve", "off")
 
-    # Create model
-    y, z = create_p_median_model(h, G, dsorted, p, maxk)
+    # Create vector of Dik, sorted-neighbor arrays and threshold cuts, shared
+    # by the model build, every zebra iteration and the completion rows
+    dsorted = compute_sorted_dist(D)
+    order, sdist = compute_neighbor_order(D)
+    cuts = compute_threshold_cuts(sdist, dsorted)
 
-    # Relax y variables
-    for var in y:
-        h.setContinuous(var)
+    # Create model
+    y, z_idx = create_p_median_model(h, order, cuts, dsorted, p, maxk)
+
+    # Relax y variables with one bulk integrality change
+    y_idx = np.asarray([var.index for var in y], dtype=np.int32)
+    _check_status(
+        h.changeColsIntegrality(
+            n, y_idx, np.full(n, int(highspy.HighsVarType.kContinuous), dtype=np.uint8)
+        ),
+        "changeColsIntegrality",
+    )
 
     # Use column generation to solve the LP relaxation
-    kdict, newk = zebra_column_generation_lp(h, G, dsorted, maxk, y, z)
+    kdict = zebra_column_generation_lp(h, order, cuts, dsorted, maxk, y, z_idx)
 
-    # Add constraints to complete the MIP
-    h.addConstrs(
-        create_z_y_def_linexpr(h, G, y, z, i, kdict[i] + 1, dsorted[i][kdict[i]] + 1)
-        >= 1
-        for i in newk
-    )
+    # Seed the MIP with a rounded relaxation solution: open the p depots
+    # with the largest LP values. HiGHS treats the partial solution as a
+    # starting guess to refine, not a feasibility requirement
+    y_vals = np.asarray(h.getSolution().col_value)[y_idx]
+    rounded = np.zeros(n)
+    rounded[np.argpartition(y_vals, -p)[-p:]] = 1.0
+    h.setSolution(n, y_idx, rounded)
 
     # Make y variables binary again
-    for var in y:
-        h.setInteger(var)
+    _check_status(
+        h.changeColsIntegrality(
+            n, y_idx, np.full(n, int(highspy.HighsVarType.kInteger), dtype=np.uint8)
+        ),
+        "changeColsIntegrality",
+    )
 
-    # Solve MIP
-    h.run()
+    # Re-enable presolve and the default solver choice for the final MIP
+    # solve, which starts from the relaxation basis on the same Highs
+    # instance. p-median models carry heavy depot-permutation symmetry, so
+    # leave symmetry detection off rather than paying for it at the root
+    h.setOptionValue("solver", "choose")
+    h.setOptionValue("presolve", "on")
+    h.setOptionValue("mip_rel_gap", 1e-4)
+    h.setOptionValue("mip_detect_symmetry", False)
+
+    # The truncated model undercharges any node whose nearest open depot
+    # lies beyond its last generated threshold, so it is a relaxation of the
+    # full radius formulation. Solve it, extend the levels of every such
+    # node up to its nearest-depot distance and re-solve; once each node is
+    # served within its generated levels, the model cost of the incumbent
+    # equals its true cost and the depots are optimal for the full problem.
+    # Nodes whose unique distances are exhausted already carry every level
+    limits = np.array(
+        [dsorted[i][min(kdict[i], len(dsorted[i]) - 1)] for i in range(n)],
+        dtype=np.int64,
+    )
+    while True:
+        # Solve MIP
+        h.run()
 
-    # Ensure problem was solved successfully
-    status = h.getModelStatus()
-    if status != highspy.HighsModelStatus.kOptimal:
-        raise RuntimeError(f"Solver failed with status {status}")
+        # Ensure problem was solved successfully
+        status = h.getModelStatus()
+        if status != highspy.HighsModelStatus.kOptimal:
+            raise RuntimeError(f"Solver failed with status {status}")
 
-    # Get depots in solution
-    depots = get_optimal_depots(h, y)
+        # Get depots in solution
+        depots = get_optimal_depots(h, y)
+
+        nearest = D[:, depots].min(axis=1)
+        offenders = np.flatnonzero(nearest > limits)
+        if offenders.size == 0:
+            break
+
+        # Create the missing z variables and rows for the offending nodes,
+        # each pushed in one batch like a column-generation iteration
+        base = h.getNumCol()
+        costs: List[float] = []
+        row_i: List[int] = []
+        row_k: List[int] = []
+        for i in offenders.tolist():
+            target = int(np.searchsorted(dsorted[i], nearest[i]))
+            for k in range(kdict[i] + 1, target + 1):
+                z_idx[i, k] = base + len(costs)
+                costs.append(float(dsorted[i][k] - dsorted[i][k - 1]))
+                row_i.append(i)
+                row_k.append(k)
+            kdict[i] = target
+            limits[i] = dsorted[i][target]
+
+        num_new = len(costs)
+        _check_status(
+            h.addCols(
+                num_new,
+                np.asarray(costs, dtype=np.float64),
+                np.zeros(num_new),
+                np.ones(num_new),
+                0,
+                np.empty(0, dtype=np.int32),
+                np.empty(0, dtype=np.int32),
+                np.empty(0, dtype=np.float64),
+            ),
+            "addCols",
+        )
+        add_z_y_def_rows(
+            h,
+            order,
+            y,
+            z_idx,
+            np.asarray(row_i, dtype=np.int64),
+            np.asarray(row_k, dtype=np.int64),
+            np.array([cuts[i][k] for i, k in zip(row_i, row_k)], dtype=np.int64),
+        )
+
+        # Keep the incumbent depots as the warm start for the re-solve
+        rounded = np.zeros(n)
+        rounded[depots] = 1.0
+        h.setSolution(n, y_idx, rounded)
 
     print(f"Problem solved in {time.time() - start:.2f} seconds")
 
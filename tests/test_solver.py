@@ -49,3 +49,35 @@ def test_p_median_mip(case):
     depots = solver.solve_p_median_mip(G, case["p"])
 
     assert depots == case["expected_depots"]
+
+
+@pytest.mark.parametrize("case", test_cases, ids=[case["name"] for case in test_cases])
+def test_p_median_mip_model(case, monkeypatch):
+    # All cases fall under the enumeration threshold, so disable it to keep
+    # the HiGHS model build-and-solve path covered as well
+    monkeypatch.setattr(solver, "_ENUM_MAX_COMBINATIONS", 0)
+
+    G = nx.Graph()
+
+    for node_id, pos in case["nodes"].items():
+        G.add_node(node_id, pos=pos)
+
+    graph.generate_all_edges(G)
+
+    depots = solver.solve_p_median_mip(G, case["p"])
+
+    assert depots == case["expected_depots"]
+
+
+@pytest.mark.parametrize("case", test_cases, ids=[case["name"] for case in test_cases])
+def test_p_median_zebra(case):
+    G = nx.Graph()
+
+    for node_id, pos in case["nodes"].items():
+        G.add_node(node_id, pos=pos)
+
+    graph.generate_all_edges(G)
+
+    depots = solver.solve_p_median_zebra(G, case["p"])
+
+    assert depots == case["expected_depots"]